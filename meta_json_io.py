@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""meta.json等JSON文件的读写工具，供仓库根目录下的脚本共用"""
+
+import json
+import mmap
+import os
+
+try:
+    import orjson
+except ImportError:  # orjson是可选依赖，缺失时回退到标准库json
+    orjson = None
+
+def loads_json(raw):
+    """将UTF-8字节（或支持缓冲区协议的对象）解析为JSON对象"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(bytes(raw))
+
+def dumps_json(data):
+    """将JSON对象序列化为两空格缩进的UTF-8字节"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def read_json_file(path):
+    """读取JSON文件，失败时抛出异常，由调用方处理
+
+    以只读方式映射文件，直接从映射页解析，避免整份读入内存再解码
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return loads_json(view)
+
+def write_json_file(path, data):
+    """写入JSON文件，失败时清理临时文件并抛出异常，由调用方处理
+
+    先写入临时文件再原子替换，写入中途失败时原文件保持完整
+    """
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps_json(data))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
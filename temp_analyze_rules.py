@@ -1,56 +1,55 @@
 import os
-import json
+import logging
 import re
-import yaml
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 
+from meta_json_io import read_json_file, write_json_file
+
+log = logging.getLogger(__name__)
+
 # 定义路径
 RULES_DIR = "awesome-cursorrules/rules"
 META_JSON_PATH = "resources/rules/meta.json"
 
+# 预编译的正则表达式
+HEADING_RE = re.compile(r'^#+\s*')
+CURSORRULES_SUFFIX_RE = re.compile(r'-cursorrules-prompt-file/?$')
+COMMENT_RE = re.compile(r'\s#')
+MAPPING_KEY_RE = re.compile(r'^[^\s#][^:]*:(\s|$)')
+
+# 常见语言
+_LANG = frozenset({'typescript', 'javascript', 'python', 'php', 'solidity', 'c#', 'csharp', 'rust', 'go'})
+# 常见框架
+_FRAMEWORK = frozenset({'react', 'angular', 'vue', 'nextjs', 'fastapi', 'flask', 'django', 'laravel', 'express', 'nestjs', 'tailwind', 'shadcn', 'sveltekit', 'svelte', 'qwik', 'solid'})
+# 常见工具
+_TOOL = frozenset({'vite', 'webpack', 'jest', 'cypress', 'storybook', 'pwa', 'vercel', 'netlify', 'supabase', 'mongodb', 'firebase'})
+# 需要特殊显示的框架名称
+_FRAMEWORK_DISPLAY = {'nextjs': 'Next.js', 'nestjs': 'NestJS', 'fastapi': 'FastAPI'}
+
 # 读取现有的meta.json文件
 def read_existing_meta():
     try:
-        with open(META_JSON_PATH, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return read_json_file(META_JSON_PATH)
     except:
         return {"rules": [], "version": "1.0.0", "lastUpdated": "2023-07-12"}
 
 # 从目录名称中提取技术栈信息
 def extract_tech_stack_from_dirname(dirname):
     # 移除通用后缀
-    clean_name = re.sub(r'-cursorrules-prompt-file/?$', '', dirname)
+    clean_name = CURSORRULES_SUFFIX_RE.sub('', dirname)
     
     # 分割技术名称
-    tech_parts = clean_name.split('-')
-    
-    languages = []
-    frameworks = []
-    tools = []
-    
-    # 常见语言
-    lang_keywords = ['typescript', 'javascript', 'python', 'php', 'solidity', 'c#', 'csharp', 'rust', 'go']
-    # 常见框架
-    framework_keywords = ['react', 'angular', 'vue', 'nextjs', 'fastapi', 'flask', 'django', 'laravel', 'express', 'nestjs', 'tailwind', 'shadcn', 'sveltekit', 'svelte', 'qwik', 'solid']
-    # 常见工具
-    tool_keywords = ['vite', 'webpack', 'jest', 'cypress', 'storybook', 'pwa', 'vercel', 'netlify', 'supabase', 'mongodb', 'firebase']
-    
-    for part in tech_parts:
-        part = part.lower()
-        if part in lang_keywords:
-            languages.append(part.capitalize())
-        elif part in framework_keywords:
-            # 特殊处理一些框架名称
-            if part == 'nextjs':
-                frameworks.append('Next.js')
-            elif part == 'nestjs':
-                frameworks.append('NestJS')
-            elif part == 'fastapi':
-                frameworks.append('FastAPI')
-            else:
-                frameworks.append(part.capitalize())
-        elif part in tool_keywords:
-            tools.append(part.capitalize())
+    tech_parts = clean_name.lower().split('-')
+    
+    # 用集合交集一次取出各类关键字，再按在目录名中出现的顺序排列，保证输出稳定
+    parts = set(tech_parts)
+    order = tech_parts.index
+    languages = [part.capitalize() for part in sorted(parts & _LANG, key=order)]
+    # 特殊处理一些框架名称
+    frameworks = [_FRAMEWORK_DISPLAY.get(part, part.capitalize()) for part in sorted(parts & _FRAMEWORK, key=order)]
+    tools = [part.capitalize() for part in sorted(parts & _TOOL, key=order)]
     
     return {
         "languages": languages,
@@ -58,82 +57,199 @@ def extract_tech_stack_from_dirname(dirname):
         "tools": tools
     }
 
+# 双引号字符串中的转义字符
+_DOUBLE_QUOTE_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'n': '\n', 't': '\t', 'r': '\r', '0': '\0', ' ': ' '}
+
+# 解析frontmatter中的单个标量值，空值视为None（与YAML一致）
+# 引号字符串按YAML规则反转义（"..."中的\"、'...'中的''），无引号的值去掉行尾的 # 注释
+def _parse_frontmatter_value(value):
+    value = value.strip()
+    quote = value[:1]
+    if quote in ('"', "'"):
+        chars = []
+        i = 1
+        while i < len(value):
+            char = value[i]
+            if quote == '"' and char == '\\' and i + 1 < len(value):
+                chars.append(_DOUBLE_QUOTE_ESCAPES.get(value[i + 1], '\\' + value[i + 1]))
+                i += 2
+            elif char == quote:
+                if quote == "'" and value[i + 1:i + 2] == "'":
+                    chars.append("'")
+                    i += 2
+                    continue
+                # 结束引号之后只可能是注释，忽略
+                return ''.join(chars) or None
+            else:
+                chars.append(char)
+                i += 1
+        # 引号未闭合，按原文保留
+        return value
+    
+    comment = COMMENT_RE.search(value)
+    if comment:
+        value = value[:comment.start()]
+    return value.strip() or None
+
+# 折叠多行文本：相邻的非空行用空格连接，空行保留为换行
+def _fold_lines(lines):
+    parts = []
+    for line in lines:
+        if not line:
+            parts.append('\n')
+        else:
+            if parts and parts[-1] != '\n':
+                parts.append(' ')
+            parts.append(line)
+    return ''.join(parts)
+
+# 解析块标量（| 保留换行，> 折叠换行），按 -/+ 处理末尾换行，与YAML一致
+def _parse_block_scalar(header, block_lines):
+    indent = min((len(line) - len(line.lstrip()) for line in block_lines if line.strip()), default=0)
+    lines = [line[indent:] if line.strip() else '' for line in block_lines]
+    
+    # 末尾的空行只参与换行保留（+）
+    trailing = 0
+    while lines and not lines[-1]:
+        lines.pop()
+        trailing += 1
+    if not lines:
+        return None
+    
+    text = '\n'.join(lines) if header[0] == '|' else _fold_lines(lines)
+    
+    if '-' in header:
+        return text
+    if '+' in header:
+        return text + '\n' * (trailing + 1)
+    return text + '\n'
+
+# 解析frontmatter：实际使用中基本是扁平的key: value结构，逐行拆分即可，无需PyYAML
+def parse_frontmatter(frontmatter_lines):
+    frontmatter = {}
+    lines = [line.rstrip('\r\n') for line in frontmatter_lines]
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+        # 跳过注释、空行和不属于任何键的缩进行
+        if not line.strip() or line[0] in ' \t#' or ':' not in line:
+            continue
+        key, _, value = line.partition(':')
+        key = key.strip()
+        value = value.strip()
+        
+        # 收集后面缩进的续行（中间可以夹空行）
+        continuation = []
+        while i < len(lines) and (not lines[i].strip() or lines[i][0] in ' \t'):
+            continuation.append(lines[i])
+            i += 1
+        
+        if value[:1] in ('|', '>'):
+            # 块标量
+            frontmatter[key] = _parse_block_scalar(value.split('#', 1)[0].strip(), continuation)
+            continue
+        if value[:1] in ('[', '{'):
+            # 流式列表/映射无法用简单规则解析，不记录该键，交由默认值/标题兜底
+            continue
+        
+        rest = [line.strip() for line in continuation if not line.strip().startswith('#')]
+        while rest and not rest[-1]:
+            rest.pop()
+        if not value and rest and (rest[0] == '-' or rest[0].startswith('- ') or MAPPING_KEY_RE.match(rest[0])):
+            # 块列表/嵌套映射同样不记录
+            continue
+        if rest:
+            # 多行的普通标量：续行折叠到值后面
+            value = _fold_lines([value] + rest if value else rest)
+        frontmatter[key] = _parse_frontmatter_value(value)
+    
+    return frontmatter
+
 # 从.mdc文件中提取frontmatter和内容
 def extract_mdc_info(file_path):
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            frontmatter = {}
+            # 尚未处理的正文行
+            pending_lines = []
             
-        # 检查是否有frontmatter (---...---)
-        frontmatter = {}
-        description = ""
-        
-        # 查找frontmatter
-        frontmatter_match = re.search(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
-        if frontmatter_match:
-            frontmatter_text = frontmatter_match.group(1)
-            try:
-                frontmatter = yaml.safe_load(frontmatter_text)
-                description = frontmatter.get('description', '')
-            except:
-                pass
-                
-        # 从文件内容中提取第一行作为标题（如果没有提取到frontmatter的描述）
-        if not description:
-            # 移除frontmatter并分割行
-            clean_content = re.sub(r'^---\s*\n.*?\n---\s*\n', '', content, flags=re.DOTALL)
-            lines = clean_content.strip().split('\n')
+            # frontmatter (---...---) 总在文件开头，逐行读到结束标记即可，不必读取整个文件
+            first_line = f.readline()
+            if first_line.rstrip() == '---':
+                frontmatter_lines = []
+                for line in f:
+                    if line.rstrip() == '---':
+                        frontmatter = parse_frontmatter(frontmatter_lines)
+                        break
+                    frontmatter_lines.append(line)
+                else:
+                    # 没有结束标记，不是frontmatter，按正文处理
+                    pending_lines = [first_line] + frontmatter_lines
+            else:
+                pending_lines = [first_line]
             
-            # 提取第一个非空行作为标题
-            for line in lines:
-                if line.strip():
-                    # 如果以#开头，则删除#和周围的空格
-                    title_line = re.sub(r'^#+\s*', '', line.strip())
-                    description = title_line
-                    break
+            description = frontmatter.get('description')
+            
+            # 从文件内容中提取第一行作为标题（如果没有提取到frontmatter的描述）
+            if not description:
+                # 提取第一个非空行作为标题，找到后停止读取
+                for line in chain(pending_lines, f):
+                    if line.strip():
+                        # 如果以#开头，则删除#和周围的空格
+                        title_line = HEADING_RE.sub('', line.strip())
+                        description = title_line
+                        break
         
-        return description, frontmatter.get('globs', '**/*.*')
+        return description or "", frontmatter.get('globs', '**/*.*')
     except Exception as e:
-        print(f"Error processing {file_path}: {e}")
+        log.warning("Error processing %s: %s", file_path, e)
         return "", "**/*.*"
 
 # 从目录中扫描所有规则文件
 def scan_rule_directory(dir_path):
     rule_files = []
+    # 目录的相对路径前缀只需计算一次，循环内直接拼接文件名
+    rel_prefix = os.path.relpath(dir_path, "awesome-cursorrules/rules") + os.sep
     try:
-        # 获取目录中所有的.mdc文件
-        for filename in os.listdir(dir_path):
-            if filename.endswith('.mdc') and not filename.startswith('.'):
-                file_path = os.path.join(dir_path, filename)
-                description, globs = extract_mdc_info(file_path)
-                
-                # 从文件名中提取规则ID
-                rule_id = os.path.splitext(filename)[0].lower()
-                
-                rule_files.append({
-                    "file": filename,
-                    "path": os.path.relpath(file_path, "awesome-cursorrules/rules"),
-                    "description": description,
-                    "globs": globs,
-                    "id": rule_id
-                })
+        # 获取目录中所有的.mdc文件（scandir自带文件类型，无需额外stat）
+        with os.scandir(dir_path) as it:
+            entries = [
+                entry for entry in it
+                if entry.name.endswith('.mdc') and not entry.name.startswith('.') and entry.is_file(follow_symlinks=False)
+            ]
+        
+        rule_files = [
+            {
+                "file": entry.name,
+                "path": rel_prefix + entry.name,
+                "description": (info := extract_mdc_info(entry.path))[0],
+                "globs": info[1],
+                # 从文件名中提取规则ID（已过滤为.mdc文件，直接去掉后缀）
+                "id": entry.name[:-4].lower()
+            }
+            for entry in entries
+        ]
     except Exception as e:
-        print(f"Error scanning directory {dir_path}: {e}")
+        log.warning("Error scanning directory %s: %s", dir_path, e)
     
     return rule_files
 
+# 从目录名称生成规则ID
+def rule_id_from_dirname(dirname):
+    return dirname.replace('-cursorrules-prompt-file', '')
+
 # 生成规则条目
-def generate_rule_entry(rule_dir, rule_files):
-    # 从目录名称生成规则ID
-    base_dir_name = os.path.basename(rule_dir)
-    rule_id = base_dir_name.replace('-cursorrules-prompt-file', '')
+def generate_rule_entry(rule_dir, rule_files, dir_name=None):
+    # 从目录名称生成规则ID（调用方已有DirEntry.name时直接传入）
+    base_dir_name = dir_name or os.path.basename(rule_dir)
+    rule_id = rule_id_from_dirname(base_dir_name)
     
     # 从目录名提取技术栈信息
     tech_stack = extract_tech_stack_from_dirname(base_dir_name)
     
-    # 生成标签
-    tags = tech_stack['languages'] + tech_stack['frameworks'] + tech_stack['tools']
-    tags = [tag.lower() for tag in tags]
+    # 生成标签（按出现顺序去重）
+    tags = list(dict.fromkeys(tag.lower() for tag in chain(tech_stack['languages'], tech_stack['frameworks'], tech_stack['tools'])))
     
     # 创建规则描述
     if rule_files:
@@ -169,22 +285,32 @@ def main():
     # 创建一个集合来跟踪现有规则的ID
     existing_rule_ids = {rule["id"] for rule in existing_rules}
     
-    # 扫描awesome-cursorrules/rules目录
+    # 收集awesome-cursorrules/rules下的规则目录（只处理目录）
+    # 规则ID只取决于目录名，已存在于meta.json中的规则无需再扫描
+    with os.scandir(RULES_DIR) as it:
+        rule_dirs = [
+            entry for entry in it
+            if entry.is_dir(follow_symlinks=False) and rule_id_from_dirname(entry.name) not in existing_rule_ids
+        ]
+    
+    # 扫描目录中的规则文件：以文件I/O为主，用线程池并发扫描
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        scanned = list(executor.map(lambda rule_dir: scan_rule_directory(rule_dir.path), rule_dirs))
+    
     new_rules = []
-    for item in os.listdir(RULES_DIR):
-        item_path = os.path.join(RULES_DIR, item)
-        
-        # 只处理目录
-        if os.path.isdir(item_path):
-            # 扫描目录中的规则文件
-            rule_files = scan_rule_directory(item_path)
-            
-            # 生成规则条目
-            rule_entry = generate_rule_entry(item_path, rule_files)
-            
-            # 如果规则ID不在现有规则中，则添加到新规则列表
-            if rule_entry["id"] not in existing_rule_ids:
-                new_rules.append(rule_entry)
+    for entry, rule_files in zip(rule_dirs, scanned):
+        # 生成规则条目
+        new_rules.append(generate_rule_entry(entry.path, rule_files, entry.name))
+    
+    # 输出结果
+    print(f"Found {len(new_rules)} new rules")
+    print(f"Total rules: {len(meta_data['rules']) + len(new_rules)}")
+    
+    # 没有新规则时meta.json内容不变，无需重写
+    if not new_rules:
+        print(f"{META_JSON_PATH} is up to date")
+        return
     
     # 将新规则添加到现有规则中
     meta_data["rules"].extend(new_rules)
@@ -193,15 +319,11 @@ def main():
     from datetime import datetime
     meta_data["lastUpdated"] = datetime.now().strftime("%Y-%m-%d")
     
-    # 输出结果
-    print(f"Found {len(new_rules)} new rules")
-    print(f"Total rules: {len(meta_data['rules'])}")
-    
     # 将结果写入meta.json
-    with open(META_JSON_PATH, 'w', encoding='utf-8') as f:
-        json.dump(meta_data, f, ensure_ascii=False, indent=2)
+    write_json_file(META_JSON_PATH, meta_data)
     
     print(f"Updated {META_JSON_PATH}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     main() 
\ No newline at end of file